@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('condottieri_events', '0002_auto_20190910_2007'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='baseevent',
+            index=models.Index(fields=['game', 'year', 'season', 'phase'], name='baseevent_game_date_idx'),
+        ),
+    ]
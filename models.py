@@ -20,21 +20,17 @@
 
 """
 
+import threading
+from functools import lru_cache, partial
+from itertools import groupby
+
 ## django
-from django.db import models
+from django.db import connections, models, router, transaction
 from condottieri_common.translation_compat import ugettext_lazy as _
 from django.template.defaultfilters import capfirst
 from django.contrib.auth.models import User
 from django.conf import settings
-
-## machiavelli - lazy import to avoid circular dependencies
-_machiavelli_models = None
-
-def get_machiavelli_models():
-	global _machiavelli_models
-	if _machiavelli_models is None:
-		import machiavelli.models as _machiavelli_models
-	return _machiavelli_models
+from django.utils.translation import get_language
 
 import condottieri_scenarios.models as scenarios
 
@@ -114,6 +110,28 @@ EXPENSE_TYPES = (
 	(11, _("Hire a diplomat in foreign area")),
 )
 
+def _choices_display(choices):
+	""" Returns a function that gives the label of a value in choices. The
+	labels are translated only once for each language. """
+	labels = dict(choices)
+
+	@lru_cache(maxsize=None)
+	def _display(value, language):
+		return str(labels[value])
+
+	def display(value):
+		## like get_FOO_display, values out of choices are returned unchanged
+		if value not in labels:
+			return value
+		return _display(value, get_language())
+	return display
+
+_season_display = _choices_display(SEASONS)
+_phase_display = _choices_display(GAME_PHASES)
+_unit_event_display = _choices_display(UNIT_EVENTS)
+_country_event_display = _choices_display(COUNTRY_EVENTS)
+_disaster_event_display = _choices_display(DISASTER_EVENTS)
+
 class BaseEvent(models.Model):
 	"""
 BaseEvent is the parent class for all kind of game events.
@@ -123,48 +141,67 @@ BaseEvent is the parent class for all kind of game events.
 	season = models.PositiveIntegerField(choices=SEASONS)
 	phase = models.PositiveIntegerField(choices=GAME_PHASES)
 	classname = models.CharField(max_length=32, editable=False)
+
+	class Meta:
+		ordering = ['-year', '-season', '-id']
+		indexes = [
+			models.Index(fields=['game', 'year', 'season', 'phase'],
+				name='baseevent_game_date_idx'),
+		]
 	
+	def __init__(self, *args, **kwargs):
+		super(BaseEvent, self).__init__(*args, **kwargs)
+		## from_db passes the field values as positional arguments
+		if not args and not kwargs.get('classname'):
+			self.classname = type(self).__name__
+
 	def __str__(self):
-		return self.event_class().event_text()
+		if type(self) is BaseEvent and self.classname in _EVENT_CLASSES:
+			## events queried through BaseEvent are shown as their concrete event
+			return str(getattr(self, self.classname.lower()))
+		return self.event_text()
+
+	def event_text(self):
+		""" Returns a short description of the event. """
+		text = capfirst(self._meta.verbose_name)
+		area = getattr(self, 'area', None)
+		if area is not None:
+			text = "%s: %s" % (text, area)
+		return text
+
+	def get_season_display(self):
+		return _season_display(self.season)
+
+	def get_phase_display(self):
+		return _phase_display(self.phase)
 	
 	def event_class(self):
 		""" Returns the appropriate event class for this event. """
-		from . import events
-		return getattr(events, self.classname)
+		return _EVENT_CLASSES.get(self.classname, type(self))
 
 class NewUnitEvent(BaseEvent):
 	""" Event triggered when a new unit is created. """
 	country = models.ForeignKey(scenarios.Country, on_delete=models.CASCADE)
 	type = models.CharField(max_length=1, choices=UNIT_TYPES)
 	area = models.ForeignKey(scenarios.Area, on_delete=models.CASCADE)
-	
-	def event_class(self):
-		return NewUnitEvent
 
 def log_new_unit(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().Unit), "sender must be a Unit"
-	log_event(NewUnitEvent, sender.player.game,
-					classname="NewUnitEvent",
-					country=sender.player.country,
+	return _queue_event(NewUnitEvent(game=sender.player.game,
+					country_id=sender.player.country_id,
 					type=sender.type,
-					area=sender.area.board_area)
+					area_id=sender.area.board_area_id))
 
 class DisbandEvent(BaseEvent):
 	""" Event triggered when a unit is disbanded. """
 	country = models.ForeignKey(scenarios.Country, blank=True, null=True, on_delete=models.CASCADE)
 	type = models.CharField(max_length=1, choices=UNIT_TYPES)
 	area = models.ForeignKey(scenarios.Area, on_delete=models.CASCADE)
-	
-	def event_class(self):
-		return DisbandEvent
 
 def log_disband(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().Unit), "sender must be a Unit"
-	log_event(DisbandEvent, sender.player.game,
-					classname="DisbandEvent",
-					country=sender.player.country,
+	return _queue_event(DisbandEvent(game=sender.player.game,
+					country_id=sender.player.country_id,
 					type=sender.type,
-					area=sender.area.board_area)
+					area_id=sender.area.board_area_id))
 
 class OrderEvent(BaseEvent):
 	""" Event triggered when an order is confirmed. """
@@ -179,52 +216,42 @@ class OrderEvent(BaseEvent):
 	subcode = models.CharField(max_length=1, choices=ORDER_SUBCODES, blank=True, null=True)
 	subdestination = models.ForeignKey(scenarios.Area, blank=True, null=True, related_name='event_subdestination', on_delete=models.CASCADE)
 	subconversion = models.CharField(max_length=1, choices=UNIT_TYPES, blank=True, null=True)
-	
-	def event_class(self):
-		return OrderEvent
 
 def log_order(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().Order), "sender must be an Order"
-	try:
-		destination = sender.destination.board_area
-	except:
-		destination = None
-	if isinstance(sender.subunit, get_machiavelli_models().Unit):
+	if sender.destination_id is not None:
+		destination_id = sender.destination.board_area_id
+	else:
+		destination_id = None
+	if sender.subunit_id is not None:
 		subtype = sender.subunit.type
-		suborigin = sender.subunit.area.board_area
+		suborigin_id = sender.subunit.area.board_area_id
 	else:
 		subtype = None
-		suborigin = None
-	try:
-		subdestination = sender.subdestination.board_area
-	except:
-		subdestination = None
-	log_event(OrderEvent, sender.unit.player.game,
-					classname="OrderEvent",
-					country=sender.unit.player.country,
+		suborigin_id = None
+	if sender.subdestination_id is not None:
+		subdestination_id = sender.subdestination.board_area_id
+	else:
+		subdestination_id = None
+	return _queue_event(OrderEvent(game=sender.unit.player.game,
+					country_id=sender.unit.player.country_id,
 					type=sender.unit.type,
-					origin=sender.unit.area.board_area,
+					origin_id=sender.unit.area.board_area_id,
 					code=sender.code,
-					destination=destination,
+					destination_id=destination_id,
 					conversion=sender.conversion,
 					subtype=subtype,
-					suborigin=suborigin,
+					suborigin_id=suborigin_id,
 					subcode=sender.subcode,
-					subdestination=subdestination,
-					subconversion=sender.subconversion)
+					subdestination_id=subdestination_id,
+					subconversion=sender.subconversion))
 
 class StandoffEvent(BaseEvent):
 	""" Event triggered when a standoff occurs. """
 	area = models.ForeignKey(scenarios.Area, on_delete=models.CASCADE)
-	
-	def event_class(self):
-		return StandoffEvent
 
 def log_standoff(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().GameArea), "sender must be a GameArea"
-	log_event(StandoffEvent, sender.game,
-					classname="StandoffEvent",
-					area=sender.board_area)
+	return _queue_event(StandoffEvent(game=sender.game,
+					area_id=sender.board_area_id))
 
 class ConversionEvent(BaseEvent):
 	""" Event triggered when a unit is converted. """
@@ -232,33 +259,23 @@ class ConversionEvent(BaseEvent):
 	area = models.ForeignKey(scenarios.Area, on_delete=models.CASCADE)
 	before = models.CharField(max_length=1, choices=UNIT_TYPES)
 	after = models.CharField(max_length=1, choices=UNIT_TYPES)
-	
-	def event_class(self):
-		return ConversionEvent
 
 def log_conversion(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().Unit), "sender must be a Unit"
-	log_event(ConversionEvent, sender.player.game,
-					classname="ConversionEvent",
-					country=sender.player.country,
-					area=sender.area.board_area,
+	return _queue_event(ConversionEvent(game=sender.player.game,
+					country_id=sender.player.country_id,
+					area_id=sender.area.board_area_id,
 					before=sender.type,
-					after=sender.conversion)
+					after=sender.conversion))
 
 class ControlEvent(BaseEvent):
 	""" Event triggered when control of an area changes. """
 	country = models.ForeignKey(scenarios.Country, null=True, blank=True, on_delete=models.CASCADE)
 	area = models.ForeignKey(scenarios.Area, on_delete=models.CASCADE)
-	
-	def event_class(self):
-		return ControlEvent
 
 def log_control(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().GameArea), "sender must be a GameArea"
-	log_event(ControlEvent, sender.player.game,
-					classname="ControlEvent",
-					country=sender.player.country,
-					area=sender.board_area)
+	return _queue_event(ControlEvent(game=sender.player.game,
+					country_id=sender.player.country_id,
+					area_id=sender.board_area_id))
 
 class MovementEvent(BaseEvent):
 	""" Event triggered when a unit moves. """
@@ -266,18 +283,13 @@ class MovementEvent(BaseEvent):
 	type = models.CharField(max_length=1, choices=UNIT_TYPES)
 	origin = models.ForeignKey(scenarios.Area, related_name="movement_origin", on_delete=models.CASCADE)
 	destination = models.ForeignKey(scenarios.Area, related_name="movement_destination", on_delete=models.CASCADE)
-	
-	def event_class(self):
-		return MovementEvent
 
 def log_movement(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().Unit), "sender must be a Unit"
-	log_event(MovementEvent, sender.player.game,
-					classname="MovementEvent",
-					country=sender.player.country,
+	return _queue_event(MovementEvent(game=sender.player.game,
+					country_id=sender.player.country_id,
 					type=sender.type,
-					origin=sender.area.board_area,
-					destination=sender.destination.board_area)
+					origin_id=sender.area.board_area_id,
+					destination_id=sender.destination.board_area_id))
 
 class RetreatEvent(BaseEvent):
 	""" Event triggered when a unit retreats. """
@@ -285,18 +297,13 @@ class RetreatEvent(BaseEvent):
 	type = models.CharField(max_length=1, choices=UNIT_TYPES)
 	origin = models.ForeignKey(scenarios.Area, related_name="retreat_origin", on_delete=models.CASCADE)
 	destination = models.ForeignKey(scenarios.Area, related_name="retreat_destination", on_delete=models.CASCADE)
-	
-	def event_class(self):
-		return RetreatEvent
 
 def log_retreat(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().Unit), "sender must be a Unit"
-	log_event(RetreatEvent, sender.player.game,
-					classname="RetreatEvent",
-					country=sender.player.country,
+	return _queue_event(RetreatEvent(game=sender.player.game,
+					country_id=sender.player.country_id,
 					type=sender.type,
-					origin=sender.area.board_area,
-					destination=sender.destination.board_area)
+					origin_id=sender.area.board_area_id,
+					destination_id=sender.destination.board_area_id))
 
 class UnitEvent(BaseEvent):
 	""" Event triggered when a unit is affected by a special event. """
@@ -304,135 +311,99 @@ class UnitEvent(BaseEvent):
 	type = models.CharField(max_length=1, choices=UNIT_TYPES)
 	area = models.ForeignKey(scenarios.Area, on_delete=models.CASCADE)
 	message = models.PositiveIntegerField(choices=UNIT_EVENTS)
-	
-	def event_class(self):
-		return UnitEvent
+
+	def get_message_display(self):
+		return _unit_event_display(self.message)
 
 def log_broken_support(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().Unit), "sender must be a Unit"
-	log_event(UnitEvent, sender.player.game,
-					classname="UnitEvent",
-					country=sender.player.country,
+	return _queue_event(UnitEvent(game=sender.player.game,
+					country_id=sender.player.country_id,
 					type=sender.type,
-					area=sender.area.board_area,
-					message=UNIT_EVENTS[0][1])
+					area_id=sender.area.board_area_id,
+					message=0))
 
 def log_forced_retreat(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().Unit), "sender must be a Unit"
-	log_event(UnitEvent, sender.player.game,
-				classname="UnitEvent",
-				country=sender.player.country,
+	return _queue_event(UnitEvent(game=sender.player.game,
+				country_id=sender.player.country_id,
 				type=sender.type,
-				area=sender.area.board_area,
-				message=UNIT_EVENTS[1][1])
+				area_id=sender.area.board_area_id,
+				message=1))
 
 def log_unit_surrender(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().Unit), "sender must be a Unit"
-	log_event(UnitEvent, sender.player.game,
-				classname="UnitEvent",
-				country=sender.player.country,
+	return _queue_event(UnitEvent(game=sender.player.game,
+				country_id=sender.player.country_id,
 				type=sender.type,
-				area=sender.area.board_area,
-				message=UNIT_EVENTS[2][1])
+				area_id=sender.area.board_area_id,
+				message=2))
 
 def log_siege_start(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().Unit), "sender must be a Unit"
-	log_event(UnitEvent, sender.player.game,
-				classname="UnitEvent",
-				country=sender.player.country,
+	return _queue_event(UnitEvent(game=sender.player.game,
+				country_id=sender.player.country_id,
 				type=sender.type,
-				area=sender.area.board_area,
-				message=UNIT_EVENTS[3][1])
+				area_id=sender.area.board_area_id,
+				message=3))
 
 def log_change_country(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().Unit), "sender must be a Unit"
-	log_event(UnitEvent, sender.player.game,
-				classname="UnitEvent",
-				country=sender.player.country,
+	return _queue_event(UnitEvent(game=sender.player.game,
+				country_id=sender.player.country_id,
 				type=sender.type,
-				area=sender.area.board_area,
-				message=UNIT_EVENTS[4][1])
+				area_id=sender.area.board_area_id,
+				message=4))
 
 def log_to_autonomous(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().Unit), "sender must be a Unit"
-	log_event(UnitEvent, sender.player.game,
-				classname="UnitEvent",
-				country=sender.player.country,
+	return _queue_event(UnitEvent(game=sender.player.game,
+				country_id=sender.player.country_id,
 				type=sender.type,
-				area=sender.area.board_area,
-				message=UNIT_EVENTS[5][1])
+				area_id=sender.area.board_area_id,
+				message=5))
 
 def log_overthrow(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().Revolution), "sender must be a Revolution"
-	log_event(CountryEvent, sender.game,
-					classname="CountryEvent",
-					country=sender.country)
+	return _queue_event(CountryEvent(game=sender.game,
+					country_id=sender.country_id))
 
 def log_conquering(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().Player), "sender must be a Player"
-	log_event(CountryEvent, sender.game,
-					classname="CountryEvent",
-					country=sender.country)
+	return _queue_event(CountryEvent(game=sender.game,
+					country_id=sender.country_id))
 
 def log_excommunication(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().Player), "sender must be a Player"
-	log_event(CountryEvent, sender.game,
-					classname="CountryEvent",
-					country=sender.country)
+	return _queue_event(CountryEvent(game=sender.game,
+					country_id=sender.country_id))
 
 def log_elimination(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().Player), "sender must be a Player"
-	log_event(CountryEvent, sender.game,
-					classname="CountryEvent",
-					country=sender.country)
+	return _queue_event(CountryEvent(game=sender.game,
+					country_id=sender.country_id))
 
 def log_assassination(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().Player), "sender must be a Player"
-	log_event(CountryEvent, sender.game,
-					classname="CountryEvent",
-					country=sender.country)
+	return _queue_event(CountryEvent(game=sender.game,
+					country_id=sender.country_id))
 
 def log_lifted_excommunication(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().Player), "sender must be a Player"
-	log_event(CountryEvent, sender.game,
-					classname="CountryEvent",
-					country=sender.country)
+	return _queue_event(CountryEvent(game=sender.game,
+					country_id=sender.country_id))
 
 def log_assassination_attempt(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().Player), "sender must be a Player"
-	log_event(CountryEvent, sender.game,
-					classname="CountryEvent",
-					country=sender.country)
+	return _queue_event(CountryEvent(game=sender.game,
+					country_id=sender.country_id))
 
 def log_famine_marker(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().GameArea), "sender must be a GameArea"
-	log_event(DisasterEvent, sender.game,
-					classname="DisasterEvent",
-					area=sender.board_area)
+	return _queue_event(DisasterEvent(game=sender.game,
+					area_id=sender.board_area_id))
 
 def log_plague(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().GameArea), "sender must be a GameArea"
-	log_event(DisasterEvent, sender.game,
-					classname="DisasterEvent",
-					area=sender.board_area)
+	return _queue_event(DisasterEvent(game=sender.game,
+					area_id=sender.board_area_id))
 
 def log_rebellion(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().GameArea), "sender must be a GameArea"
-	log_event(DisasterEvent, sender.game,
-					classname="DisasterEvent",
-					area=sender.board_area)
+	return _queue_event(DisasterEvent(game=sender.game,
+					area_id=sender.board_area_id))
 
 def log_storm_marker(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().GameArea), "sender must be a GameArea"
-	log_event(DisasterEvent, sender.game,
-					classname="DisasterEvent",
-					area=sender.board_area)
+	return _queue_event(DisasterEvent(game=sender.game,
+					area_id=sender.board_area_id))
 
 def log_income(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().Player), "sender must be a Player"
-	log_event(IncomeEvent, sender.game,
-					classname="IncomeEvent",
-					country=sender.country)
+	return _queue_event(IncomeEvent(game=sender.game,
+					country_id=sender.country_id))
 
 class ExpenseEvent(BaseEvent):
 	""" Event triggered when a country spends ducats. """
@@ -441,40 +412,30 @@ class ExpenseEvent(BaseEvent):
 	type = models.PositiveIntegerField(choices=EXPENSE_TYPES)
 	area = models.ForeignKey(scenarios.Area, null=True, blank=True, on_delete=models.CASCADE)
 	unit_type = models.CharField(max_length=1, choices=UNIT_TYPES, null=True, blank=True)
-	
-	def event_class(self):
-		return ExpenseEvent
 
 def log_expense(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().Expense), "sender must be an Expense"
 	if sender.unit:
-		_area = sender.unit.area.board_area
+		_area_id = sender.unit.area.board_area_id
 		_unit_type = sender.unit.type
 	else:
-		_area = None
+		_area_id = None
 		_unit_type = None
-	log_event(ExpenseEvent, sender.player.game,
-					classname="ExpenseEvent",
-					country=sender.player.country,
+	return _queue_event(ExpenseEvent(game=sender.player.game,
+					country_id=sender.player.country_id,
 					ducats=sender.ducats,
 					type=sender.type,
-					area=_area,
-					unit_type=_unit_type)
+					area_id=_area_id,
+					unit_type=_unit_type))
 
 class UncoverEvent(BaseEvent):
 	""" Event triggered when a diplomat uncovers a unit. """
 	country = models.ForeignKey(scenarios.Country, on_delete=models.CASCADE)
 	area = models.ForeignKey(scenarios.Area, on_delete=models.CASCADE)
-	
-	def event_class(self):
-		return UncoverEvent
 
 def log_uncover(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().Diplomat), "sender must be a Diplomat"
-	log_event(UncoverEvent, sender.player.game,
-					classname="UncoverEvent",
-					country=sender.player.country,
-					area=sender.area.board_area)
+	return _queue_event(UncoverEvent(game=sender.player.game,
+					country_id=sender.player.country_id,
+					area_id=sender.area.board_area_id))
 
 class CountryEvent(BaseEvent):
 	""" Event triggered when a country is subject to some conditions.
@@ -500,15 +461,13 @@ class CountryEvent(BaseEvent):
 	country = models.ForeignKey(scenarios.Country, on_delete=models.CASCADE)
 	message = models.PositiveIntegerField(choices=COUNTRY_EVENTS)
 
-	def event_class(self):
-		return CountryEvent
+	def get_message_display(self):
+		return _country_event_display(self.message)
 
 def log_country_event(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().CountryEvent), "sender must be a CountryEvent"
-	log_event(CountryEvent, sender.game,
-					classname="CountryEvent",
-					country=sender.country,
-					message=sender.message)
+	return _queue_event(CountryEvent(game=sender.game,
+					country_id=sender.country_id,
+					message=sender.message))
 
 class DisasterEvent(BaseEvent):
 	""" Event triggered when a province is affected by a disaster.
@@ -528,27 +487,112 @@ class DisasterEvent(BaseEvent):
 	area = models.ForeignKey(scenarios.Area, on_delete=models.CASCADE)
 	message = models.PositiveIntegerField(choices=DISASTER_EVENTS)
 
-	def event_class(self):
-		return DisasterEvent
+	def get_message_display(self):
+		return _disaster_event_display(self.message)
 
 def log_disaster(sender, **kwargs):
-	assert isinstance(sender, get_machiavelli_models().DisasterEvent), "sender must be a DisasterEvent"
-	log_event(DisasterEvent, sender.game,
-					classname="DisasterEvent",
-					area=sender.area.board_area,
-					message=sender.message)
+	return _queue_event(DisasterEvent(game=sender.game,
+					area_id=sender.area.board_area_id,
+					message=sender.message))
 
 class IncomeEvent(BaseEvent):
 	""" Event triggered when a country receives income """
 	country = models.ForeignKey(scenarios.Country, on_delete=models.CASCADE)
 	ducats = models.PositiveIntegerField()
 
-	def event_class(self):
-		return IncomeEvent
+## event classes by classname, to resolve events queried through BaseEvent
+_EVENT_CLASSES = dict((c.__name__, c) for c in (
+	NewUnitEvent,
+	DisbandEvent,
+	OrderEvent,
+	StandoffEvent,
+	ConversionEvent,
+	ControlEvent,
+	MovementEvent,
+	RetreatEvent,
+	UnitEvent,
+	ExpenseEvent,
+	UncoverEvent,
+	CountryEvent,
+	DisasterEvent,
+	IncomeEvent,
+))
+
+## events are not saved one by one, but buffered until the current transaction
+## is committed, so that they can be inserted in batches
+BULK_BATCH_SIZE = 500
+
+_local = threading.local()
 
 def log_event(event_class, game, **kwargs):
-	""" Creates a new event of the specified class. """
-	event = event_class(game=game, **kwargs)
-	event.save()
+	""" Creates a new event of the specified class. game may be a Game or its
+	id. The event is saved when the current transaction is committed. """
+	if isinstance(game, models.Model):
+		kwargs['game'] = game
+	else:
+		kwargs['game_id'] = game
+	return _queue_event(event_class(**kwargs))
+
+def _queue_event(event):
+	""" Adds an unsaved event to the events of the current transaction. """
+	if event.year is None:
+		## the event happens in the current date of the game
+		game = event.game
+		event.year, event.season, event.phase = game.year, game.season, game.phase
+	## all the events share the BaseEvent table, so they go to one database
+	db = router.db_for_write(BaseEvent)
+	connection = transaction.get_connection(db)
+	## each buffer belongs to the savepoint where it was created, so that its
+	## commit hook, and its events, are discarded if the savepoint is rolled
+	## back. Django replaces run_on_commit when a transaction or a savepoint
+	## is rolled back, so a buffer is only reused while that list is the same.
+	savepoint_ids = tuple(connection.savepoint_ids)
+	hooks = connection.run_on_commit
+	pending = getattr(_local, 'pending', None)
+	if pending is not None and pending[0] == savepoint_ids and pending[1] is hooks:
+		pending[2].append(event)
+	else:
+		buffer = [event]
+		_local.pending = (savepoint_ids, hooks, buffer)
+		transaction.on_commit(partial(_flush, buffer, db), using=db)
 	return event
 
+def _flush(buffer, db):
+	""" Commit hook that saves the events of a buffer. """
+	pending = getattr(_local, 'pending', None)
+	if pending is not None and pending[2] is buffer:
+		_local.pending = None
+	_save_events(buffer, db)
+
+def _save_events(buffer, db):
+	""" Saves and empties a buffer of events, keeping the order in which they
+	were logged. """
+	events = buffer[:]
+	del buffer[:]
+	if not events:
+		return
+	with transaction.atomic(using=db):
+		for event_class, batch in groupby(events, type):
+			_bulk_create_events(event_class, list(batch), db)
+
+def _bulk_create_events(event_class, batch, db):
+	""" Inserts a list of events of the same class.
+
+	bulk_create does not support multi-table inheritance, so the rows of
+	BaseEvent are bulk created first and then the rows of the child table are
+	inserted with the primary keys returned by the database.
+	"""
+	if not connections[db].features.can_return_rows_from_bulk_insert:
+		for event in batch:
+			event.save(using=db)
+		return
+	BaseEvent.objects.using(db).bulk_create(batch, batch_size=BULK_BATCH_SIZE)
+	for event in batch:
+		event.baseevent_ptr_id = event.id
+	## this copies what Model._do_insert does for the child table when a single
+	## event is saved; Manager._insert is a private Django API
+	fields = event_class._meta.local_concrete_fields
+	for i in range(0, len(batch), BULK_BATCH_SIZE):
+		event_class._base_manager._insert(batch[i:i + BULK_BATCH_SIZE],
+			fields=fields, using=db)
+
@@ -1,4 +1,7 @@
-from django.test import TestCase #, override_settings
+from types import SimpleNamespace
+
+from django.db import transaction
+from django.test import TestCase, skipUnlessDBFeature #, override_settings
 from django.contrib.auth.models import User
 
 from condottieri_events.models import *
@@ -34,3 +37,135 @@ class BaseTestCase(TestCase):
 
     def test_event_class(self):
         self.assertEqual(self.event_1.event_class(), "standoff-event")
+
+    def test_log_event_saved_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            event_1 = log_event(StandoffEvent, self.game, year=0, season=1,
+                    phase=0, area=self.area_1)
+            event_2 = log_event(StandoffEvent, self.game.id, year=0, season=1,
+                    phase=0, area=self.area_1)
+            self.assertIsNone(event_1.pk)
+        self.assertIsNotNone(event_1.pk)
+        self.assertLess(event_1.pk, event_2.pk)
+        event = StandoffEvent.objects.get(pk=event_2.pk)
+        self.assertEqual(event.area, self.area_1)
+
+    def test_log_event_discarded_on_savepoint_rollback(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            event_1 = log_event(StandoffEvent, self.game.id, year=0, season=1,
+                    phase=0, area=self.area_1)
+            try:
+                with transaction.atomic():
+                    event_2 = log_event(StandoffEvent, self.game.id, year=0,
+                            season=1, phase=0, area=self.area_1)
+                    raise ValueError
+            except ValueError:
+                pass
+            event_3 = log_event(StandoffEvent, self.game.id, year=0, season=1,
+                    phase=0, area=self.area_1)
+        self.assertIsNotNone(event_1.pk)
+        self.assertIsNone(event_2.pk)
+        self.assertIsNotNone(event_3.pk)
+        self.assertEqual(StandoffEvent.objects.count(), 3)
+
+    def test_log_event_ids_follow_logging_order(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            event_1 = log_event(StandoffEvent, self.game, year=0, season=1,
+                    phase=0, area=self.area_1)
+            with transaction.atomic():
+                event_2 = log_event(StandoffEvent, self.game, year=0,
+                        season=1, phase=0, area=self.area_1)
+            event_3 = log_event(StandoffEvent, self.game, year=0, season=1,
+                    phase=0, area=self.area_1)
+        self.assertLess(event_1.pk, event_2.pk)
+        self.assertLess(event_2.pk, event_3.pk)
+
+    def test_str(self):
+        self.assertEqual(str(self.event_1), "Standoff event: %s" % self.area_1)
+        event = BaseEvent.objects.get(pk=self.event_1.pk)
+        self.assertEqual(str(event), str(self.event_1))
+
+    def test_classname_default(self):
+        event = StandoffEvent(game=self.game, year=0, season=1, phase=0,
+                area=self.area_1)
+        self.assertEqual(event.classname, "StandoffEvent")
+
+    def test_classname_not_loaded_when_deferred(self):
+        with self.assertNumQueries(1):
+            list(BaseEvent.objects.only('id'))
+
+    def test_get_message_display(self):
+        event = UnitEvent(game=self.game, year=0, season=1, phase=0,
+                area=self.area_1, type="A", message=2)
+        self.assertEqual(event.get_message_display(), "surrenders.")
+        self.assertEqual(event.get_season_display(), "Spring")
+        event.message = None
+        self.assertIsNone(event.get_message_display())
+
+    def make_order(self, destination=None, subunit=None, subdestination=None):
+        """ Returns an object with the attributes of an Order """
+        player = SimpleNamespace(game=self.game, country_id=1)
+        unit = SimpleNamespace(player=player, type="A",
+                area=SimpleNamespace(board_area_id=self.area_1.id))
+        return SimpleNamespace(unit=unit, code="-", conversion=None,
+                subcode=None, subconversion=None,
+                destination=destination,
+                destination_id=destination and 10,
+                subunit=subunit,
+                subunit_id=subunit and 11,
+                subdestination=subdestination,
+                subdestination_id=subdestination and 12)
+
+    def test_log_order(self):
+        with self.captureOnCommitCallbacks():
+            event = log_order(self.make_order())
+        self.assertIsInstance(event, OrderEvent)
+        self.assertEqual(event.game_id, self.game.id)
+        self.assertEqual(event.origin_id, self.area_1.id)
+        self.assertIsNone(event.destination_id)
+        self.assertIsNone(event.subtype)
+        self.assertIsNone(event.suborigin_id)
+        self.assertIsNone(event.subdestination_id)
+
+    def test_log_order_with_subunit(self):
+        order = self.make_order(
+                destination=SimpleNamespace(board_area_id=2),
+                subunit=SimpleNamespace(type="F",
+                    area=SimpleNamespace(board_area_id=3)),
+                subdestination=SimpleNamespace(board_area_id=4))
+        with self.captureOnCommitCallbacks():
+            event = log_order(order)
+        self.assertEqual(event.destination_id, 2)
+        self.assertEqual(event.subtype, "F")
+        self.assertEqual(event.suborigin_id, 3)
+        self.assertEqual(event.subdestination_id, 4)
+
+    def test_log_broken_support(self):
+        player = SimpleNamespace(game=self.game, country_id=None)
+        unit = SimpleNamespace(player=player, type="A",
+                area=SimpleNamespace(board_area_id=self.area_1.id))
+        with self.captureOnCommitCallbacks(execute=True):
+            event = log_broken_support(unit)
+        event = UnitEvent.objects.get(pk=event.pk)
+        self.assertEqual(event.message, 0)
+        self.assertEqual((event.year, event.season, event.phase),
+                (self.game.year, self.game.season, self.game.phase))
+
+    @skipUnlessDBFeature('can_return_rows_from_bulk_insert')
+    def test_bulk_create_events(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            events = [
+                log_event(StandoffEvent, self.game, area=self.area_1),
+                log_event(StandoffEvent, self.game, area=self.area_1),
+                log_event(ControlEvent, self.game, area=self.area_1),
+                log_event(StandoffEvent, self.game, area=self.area_1),
+            ]
+        ## two INSERTs for each run of events of the same class, plus the
+        ## savepoint of the flush
+        with self.assertNumQueries(8):
+            for callback in callbacks:
+                callback()
+        ids = [event.pk for event in events]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(StandoffEvent.objects.filter(pk__in=ids).count(), 3)
+        self.assertTrue(ControlEvent.objects.filter(pk=ids[2]).exists())